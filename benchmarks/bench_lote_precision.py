@@ -0,0 +1,54 @@
+"""Compara throughput y memoria pico de MeshAnalyzer.resolver_lote por política de precisión.
+
+Incluye np.linalg.solve en float64 como referencia común.
+
+Uso: python benchmarks/bench_lote_precision.py [N]
+"""
+
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.config import PRECISION_POLICIES, RESISTANCE_RANGE, VOLTAGE_RANGE  # noqa: E402
+from src.services.mesh_analyzer import MeshAnalyzer  # noqa: E402
+
+
+def main(n: int) -> None:
+    rng = np.random.default_rng(0)
+    R = np.exp(rng.uniform(*np.log(RESISTANCE_RANGE), (n, 6)))
+    V = rng.uniform(*VOLTAGE_RANGE, (n, 3))
+
+    def linalg():
+        A, B = MeshAnalyzer.construir_sistema_lote(R, V)
+        return np.linalg.solve(A, B[..., None])[..., 0], np.zeros(n, dtype=bool)
+
+    referencia = linalg()[0]
+
+    casos = [("linalg", linalg)]
+    casos += [(precision, lambda p=precision: MeshAnalyzer.resolver_lote(R, V, p)) for precision in PRECISION_POLICIES]
+
+    print(f"N = {n}  (linalg = np.linalg.solve en float64, sin estimar condicionamiento)")
+    for nombre, resolver in casos:
+        MeshAnalyzer.resolver_lote(R[:1000], V[:1000])
+        tracemalloc.start()
+        inicio = time.perf_counter()
+        corrientes, mal_condicionadas = resolver()
+        segundos = time.perf_counter() - inicio
+        _, pico = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        error = np.max(np.abs(corrientes - referencia)) / np.max(np.abs(referencia))
+        print(
+            f"{nombre:>8}: {n / segundos / 1e6:6.2f} M sistemas/s  "
+            f"memoria pico {pico / 2**20:7.1f} MiB  error relativo {error:.1e}  "
+            f"mal condicionadas {int(mal_condicionadas.sum())}"
+        )
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
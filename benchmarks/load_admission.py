@@ -0,0 +1,102 @@
+"""Prueba de carga: latencia de rutas baratas mientras /circuito.png está saturado.
+
+Levanta la app con un servidor WSGI con un pool fijo de hilos (como gunicorn --threads), lanza renders
+concurrentes con parámetros distintos (para que no se agrupen) y mide p50/p99 de /api/calculate y
+/api/health, con y sin control de admisión.
+
+Uso: python benchmarks/load_admission.py [segundos] [hilos_render]
+"""
+
+import json
+import socketserver
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import numpy as np
+from werkzeug.serving import BaseWSGIServer
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import src.app_factory as app_factory  # noqa: E402
+from src.config import DEFAULT_VALUES, WORKER_THREADS  # noqa: E402
+
+
+class PooledWSGIServer(socketserver.ThreadingMixIn, BaseWSGIServer):
+    """Servidor WSGI con un número fijo de hilos de trabajo; el resto de conexiones espera en cola."""
+
+    def __init__(self, app, workers: int) -> None:
+        super().__init__("127.0.0.1", 0, app)
+        self.pool = ThreadPoolExecutor(max_workers=workers)
+
+    def process_request(self, request, client_address):
+        self.pool.submit(self.process_request_thread, request, client_address)
+
+
+def _request(url: str, data: bytes | None = None) -> tuple[int, float]:
+    """Devuelve (status, Retry-After en segundos o 0)."""
+    req = urllib.request.Request(url, data=data, headers={"Content-Type": "application/json"})
+    try:
+        with urllib.request.urlopen(req, timeout=30) as response:
+            response.read()
+            return response.status, 0.0
+    except urllib.error.HTTPError as exc:
+        return exc.code, float(exc.headers.get("Retry-After", 0))
+
+
+def run(admission: bool, seconds: float, render_threads: int) -> None:
+    app_factory.ADMISSION_ENABLED = admission
+    server = PooledWSGIServer(app_factory.create_app(), WORKER_THREADS)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_port}"
+    stop = time.monotonic() + seconds
+    render_status: list[int] = []
+    latencies: dict[str, list[float]] = {"/api/calculate": [], "/api/health": []}
+    failures = {path: 0 for path in latencies}
+
+    def render(worker: int) -> None:
+        i = 0
+        while time.monotonic() < stop:
+            i += 1
+            status, retry_after = _request(f"{base}/circuito.png?R1={worker}.{i}")
+            render_status.append(status)
+            # Clientes bien educados respetan Retry-After
+            time.sleep(retry_after)
+
+    def cheap(path: str, body: bytes | None) -> None:
+        while time.monotonic() < stop:
+            start = time.perf_counter()
+            status, _ = _request(base + path, body)
+            latencies[path].append(time.perf_counter() - start)
+            failures[path] += status != 200
+            time.sleep(0.01)
+
+    threads = [threading.Thread(target=render, args=(n + 1,)) for n in range(render_threads)]
+    threads.append(threading.Thread(target=cheap, args=("/api/calculate", json.dumps(DEFAULT_VALUES).encode())))
+    threads.append(threading.Thread(target=cheap, args=("/api/health", None)))
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    server.shutdown()
+    server.pool.shutdown(wait=False, cancel_futures=True)
+
+    print(f"admisión={'sí' if admission else 'no'}  renders ok={render_status.count(200)}", end="")
+    print(f"  rechazados={len(render_status) - render_status.count(200)}")
+    for path, values in latencies.items():
+        ms = np.array(values) * 1000
+        print(
+            f"  {path:<16} n={len(ms):4d}  p50={np.percentile(ms, 50):7.1f} ms  p99={np.percentile(ms, 99):7.1f} ms  "
+            f"no-200={failures[path]}"
+        )
+
+
+if __name__ == "__main__":
+    duration = float(sys.argv[1]) if len(sys.argv) > 1 else 10.0
+    renders = int(sys.argv[2]) if len(sys.argv) > 2 else 32
+    run(False, duration, renders)
+    run(True, duration, renders)
@@ -3,9 +3,21 @@ from pathlib import Path
 
 from flask import Flask, render_template, request
 
-from src.routes.api import api_bp
-from src.routes.web import web_bp
+from src.config import (
+    ADMISSION_CLASSES,
+    ADMISSION_ENABLED,
+    ADMISSION_RETRY_AFTER_SECONDS,
+    ADMISSION_ROUTES,
+    SSE_DEBOUNCE_SECONDS,
+    SSE_HEARTBEAT_SECONDS,
+    SSE_IDLE_TIMEOUT_SECONDS,
+)
+from src.routes.api import api_bp, calculate_flight_key
+from src.routes.web import circuito_flight_key, web_bp
+from src.services.admission import AdmissionController
+from src.services.live_stream import LiveStreamHub
 from src.services.mesh_analyzer import get_default_values
+from src.services.single_flight import SingleFlight
 
 logger = logging.getLogger(__name__)
 
@@ -17,9 +29,27 @@ def create_app() -> Flask:
         template_folder=str(project_root / "templates"),
         static_folder=str(project_root / "static"),
     )
+    single_flight = {"circuito": SingleFlight(), "calculate": SingleFlight()}
+    app.extensions["single_flight"] = single_flight
+    app.extensions["live_stream"] = LiveStreamHub(
+        debounce=SSE_DEBOUNCE_SECONDS,
+        heartbeat=SSE_HEARTBEAT_SECONDS,
+        idle_timeout=SSE_IDLE_TIMEOUT_SECONDS,
+    )
     app.register_blueprint(web_bp)
     app.register_blueprint(api_bp)
 
+    if ADMISSION_ENABLED:
+        AdmissionController(
+            ADMISSION_CLASSES,
+            ADMISSION_ROUTES,
+            ADMISSION_RETRY_AFTER_SECONDS,
+            coalesced={
+                "web.circuito_png": (single_flight["circuito"], circuito_flight_key),
+                "api.api_calculate": (single_flight["calculate"], calculate_flight_key),
+            },
+        ).init_app(app)
+
     register_error_handlers(app)
     return app
 
@@ -35,3 +35,63 @@ HIGH_CURRENT_WARNING_THRESHOLD = 1000.0
 ERROR_INVALID_NUMBER = "Debe ser un número válido"
 ERROR_POSITIVE_RESISTANCE = "Debe ser un valor positivo"
 ERROR_FORM_PARSE = "Error al procesar los datos. Verifica el formato de los números."
+
+OPTIMIZER_OBJECTIVES = ("perdidas", "corriente_pico")
+OPTIMIZER_GRID_POINTS = 8
+OPTIMIZER_BATCH_SIZE = 4096
+OPTIMIZER_TOP_K = 5
+# Se guardan OPTIMIZER_TOP_K * factor candidatos de la rejilla para reponer diseños duplicados tras refinar.
+OPTIMIZER_CANDIDATE_POOL_FACTOR = 4
+# Dos diseños son el mismo si todas sus resistencias coinciden con esta tolerancia relativa.
+OPTIMIZER_DEDUP_RTOL = 1e-3
+OPTIMIZER_REFINE_ITERATIONS = 40
+OPTIMIZER_DEFAULT_TIME_BUDGET = 2.0
+OPTIMIZER_MAX_TIME_BUDGET = 10.0
+
+PRECISION_POLICIES = ("float64", "mixta")
+MIXED_PRECISION_REFINEMENT_STEPS = 2
+# Por encima de este número de condición el float32 no converge con refinamiento; se re-resuelve en float64.
+MIXED_PRECISION_FALLBACK_CONDITION = 1e4
+ILL_CONDITIONED_THRESHOLD = 1e10
+
+# Tiempo máximo (s) que una petición espera un cálculo idéntico en curso antes de responder 503.
+SINGLE_FLIGHT_TIMEOUT = 30.0
+
+# Hilos de trabajo por proceso (app.run con threaded=True, o gunicorn --threads). Cada stream SSE
+# abierto ocupa uno de estos hilos dormido, así que los streams solo pueden usar una fracción.
+WORKER_THREADS = 8
+SSE_MAX_STREAMS = max(1, WORKER_THREADS // 4)
+SSE_DEBOUNCE_SECONDS = 0.15
+SSE_HEARTBEAT_SECONDS = 10.0
+# El cliente cierra su stream tras 20 s sin cambios; este límite recoge las pestañas que no lo hacen.
+SSE_IDLE_TIMEOUT_SECONDS = 30.0
+
+# Control de admisión: cada clase de coste tiene su propio límite de concurrencia y una cola corta.
+# Los endpoints que no aparecen en ADMISSION_ROUTES (health, metrics, estáticos...) no se limitan.
+# Los streams SSE duran mucho y ocupan un hilo cada uno: tienen su propia clase, sin cola.
+# Cada petición admitida o en cola ocupa un hilo, así que la suma de límites y colas se reparte
+# WORKER_THREADS y deja ADMISSION_RESERVED_THREADS libres para las rutas sin clase.
+ADMISSION_ENABLED = True
+ADMISSION_RETRY_AFTER_SECONDS = 1
+ADMISSION_RESERVED_THREADS = max(1, WORKER_THREADS // 8)
+_RENDER_THREADS = max(1, WORKER_THREADS // 8)
+_OPTIMIZE_THREADS = 1
+# Lo que queda es para los cálculos cortos: la mitad (redondeada hacia arriba) ejecuta y el resto espera.
+_COMPUTE_THREADS = (
+    WORKER_THREADS - ADMISSION_RESERVED_THREADS - SSE_MAX_STREAMS - 2 * _RENDER_THREADS - _OPTIMIZE_THREADS
+)
+ADMISSION_CLASSES: Dict[str, Dict[str, float]] = {
+    "render": {"limit": _RENDER_THREADS, "queue": _RENDER_THREADS, "wait": 2.0},
+    "optimize": {"limit": _OPTIMIZE_THREADS, "queue": 0, "wait": 0.0},
+    "compute": {"limit": _COMPUTE_THREADS - _COMPUTE_THREADS // 2, "queue": _COMPUTE_THREADS // 2, "wait": 1.0},
+    "stream": {"limit": SSE_MAX_STREAMS, "queue": 0, "wait": 0.0},
+}
+ADMISSION_ROUTES: Dict[str, str] = {
+    "web.circuito_png": "render",
+    "api.api_optimize": "optimize",
+    "api.api_calculate": "compute",
+    "api.api_contingency": "compute",
+    "api.api_stream": "stream",
+    "api.api_stream_update": "compute",
+    "web.home": "compute",
+}
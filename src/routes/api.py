@@ -1,13 +1,21 @@
 import logging
+import math
 import os
 from datetime import datetime, timezone
+from urllib.parse import urlencode
 
-from flask import Blueprint, jsonify, request
+from flask import Blueprint, Response, current_app, jsonify, request, url_for
 from werkzeug.exceptions import BadRequest
 
-from src.config import REQUIRED_PARAMS
-from src.services.mesh_analyzer import MeshAnalyzer, get_example_values
-from src.validators.inputs import validate_api_payload
+from src.config import (
+    OPTIMIZER_DEFAULT_TIME_BUDGET,
+    OPTIMIZER_MAX_TIME_BUDGET,
+    REQUIRED_PARAMS,
+    SINGLE_FLIGHT_TIMEOUT,
+)
+from src.services.design_optimizer import optimizar_diseno
+from src.services.mesh_analyzer import MeshAnalyzer, get_default_values, get_example_values
+from src.validators.inputs import validate_api_payload, validate_parameters
 
 logger = logging.getLogger(__name__)
 api_bp = Blueprint("api", __name__, url_prefix="/api")
@@ -25,6 +33,22 @@ def _api_error(status: int, code: str, message: str, details: str | None = None)
     return jsonify(payload), status
 
 
+def _solve(params: dict):
+    I1, I2, I3, A, B = MeshAnalyzer.calcular_corrientes(*(params[key] for key in REQUIRED_PARAMS))
+    return I1, I2, I3, A, B, MeshAnalyzer.interpretar_corrientes(I1, I2, I3)
+
+
+def calculate_flight_key() -> tuple[float, ...] | None:
+    """Clave de agrupación de la petición actual a /api/calculate, o None si el cuerpo no es válido."""
+    data = request.get_json(silent=True) if request.is_json else None
+    if not isinstance(data, dict):
+        return None
+    try:
+        return tuple(float(data[key]) for key in REQUIRED_PARAMS)
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
 @api_bp.route("/calculate", methods=["POST"])
 def api_calculate():
     try:
@@ -44,11 +68,10 @@ def api_calculate():
         if error:
             return _api_error(400, "INVALID_PAYLOAD", "Datos de entrada inválidos", error)
 
-        R1, R2, R3, R4, R5, R6 = (params[key] for key in REQUIRED_PARAMS[:6])
-        V1, V2, V3 = (params[key] for key in REQUIRED_PARAMS[6:])
-
-        I1, I2, I3, A, B = MeshAnalyzer.calcular_corrientes(R1, R2, R3, R4, R5, R6, V1, V2, V3)
-        interpretaciones = MeshAnalyzer.interpretar_corrientes(I1, I2, I3)
+        flight_key = tuple(params[key] for key in REQUIRED_PARAMS)
+        I1, I2, I3, A, B, interpretaciones = current_app.extensions["single_flight"]["calculate"].do(
+            flight_key, lambda: _solve(params), timeout=SINGLE_FLIGHT_TIMEOUT
+        )
 
         return jsonify(
             {
@@ -63,6 +86,8 @@ def api_calculate():
         return _api_error(400, "CALCULATION_ERROR", "Error de cálculo", str(exc))
     except BadRequest:
         return _api_error(400, "MALFORMED_JSON", "JSON malformado")
+    except TimeoutError as exc:
+        return _api_error(503, "TIMEOUT", "Tiempo de espera agotado", str(exc))
     except Exception:
         logger.exception(
             "Error en API calculate",
@@ -71,6 +96,119 @@ def api_calculate():
         return _api_error(500, "INTERNAL_ERROR", "Error interno del servidor")
 
 
+@api_bp.route("/contingency", methods=["POST"])
+def api_contingency():
+    data = request.get_json(silent=True) if request.is_json else None
+    if not isinstance(data, dict):
+        return _api_error(400, "INVALID_PAYLOAD", "Datos de entrada inválidos", "Se esperaba un objeto JSON")
+
+    try:
+        params, error = validate_api_payload(data)
+        if error:
+            return _api_error(400, "INVALID_PAYLOAD", "Datos de entrada inválidos", error)
+        double = data.get("double", False)
+        if not isinstance(double, bool):
+            return _api_error(400, "INVALID_PAYLOAD", "Datos de entrada inválidos", "double debe ser true o false")
+        result = MeshAnalyzer.analizar_contingencias(params, dobles=double)
+    except ValueError as exc:
+        return _api_error(400, "CALCULATION_ERROR", "Error de cálculo", str(exc))
+    except Exception:
+        logger.exception(
+            "Error en API contingency",
+            extra={"method": request.method, "path": request.path, "query": request.query_string.decode("utf-8")},
+        )
+        return _api_error(500, "INTERNAL_ERROR", "Error interno del servidor")
+    return jsonify({"success": True, **result})
+
+
+@api_bp.route("/stream", methods=["GET"])
+def api_stream():
+    hub = current_app.extensions["live_stream"]
+    stream_id = hub.open(get_default_values())
+    flight = current_app.extensions["single_flight"]["calculate"]
+    diagram_base = url_for("web.circuito_png") if request.args.get("diagram") == "1" else None
+
+    def compute(params):
+        I1, I2, I3, _, _, interpretaciones = flight.do(
+            tuple(params[key] for key in REQUIRED_PARAMS), lambda: _solve(params), timeout=SINGLE_FLIGHT_TIMEOUT
+        )
+        payload = {"currents": {"I1": I1, "I2": I2, "I3": I3}, "interpretations": interpretaciones}
+        if diagram_base:
+            payload["diagram_url"] = f"{diagram_base}?{urlencode(params)}"
+        return payload
+
+    response = Response(
+        hub.events(stream_id, compute),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+    # Libera el cupo aunque el cliente nunca lea el cuerpo (p. ej. HEAD) y el generador no arranque.
+    response.call_on_close(lambda: hub.close(stream_id))
+    return response
+
+
+@api_bp.route("/stream/<stream_id>", methods=["POST"])
+def api_stream_update(stream_id: str):
+    hub = current_app.extensions["live_stream"]
+    params = hub.current(stream_id)
+    if params is None:
+        return _api_error(404, "STREAM_NOT_FOUND", "Stream no encontrado")
+
+    data = request.get_json(silent=True) if request.is_json else None
+    if not isinstance(data, dict):
+        return _api_error(400, "INVALID_PAYLOAD", "Datos de entrada inválidos", "Se esperaba un objeto JSON")
+
+    try:
+        params.update({key: float(data[key]) for key in REQUIRED_PARAMS if key in data})
+    except (TypeError, ValueError):
+        return _api_error(400, "INVALID_PAYLOAD", "Datos de entrada inválidos", "Los parámetros deben ser numéricos")
+    try:
+        validate_parameters(params)
+    except ValueError as exc:
+        return _api_error(400, "INVALID_PAYLOAD", "Datos de entrada inválidos", str(exc))
+
+    if not hub.update(stream_id, params):
+        return _api_error(404, "STREAM_NOT_FOUND", "Stream no encontrado")
+    return jsonify({"success": True}), 202
+
+
+@api_bp.route("/optimize", methods=["POST"])
+def api_optimize():
+    data = request.get_json(silent=True) if request.is_json else None
+    if not isinstance(data, dict):
+        return _api_error(400, "INVALID_PAYLOAD", "Datos de entrada inválidos", "Se esperaba un objeto JSON")
+
+    bounds = data.get("bounds")
+    if not isinstance(bounds, dict):
+        return _api_error(
+            400, "INVALID_PAYLOAD", "Datos de entrada inválidos", "bounds debe ser un objeto {Rk: [min, max]}"
+        )
+
+    try:
+        base = {key: float(value) for key, value in (data.get("params") or {}).items() if key in REQUIRED_PARAMS}
+        time_budget = data.get("time_budget", OPTIMIZER_DEFAULT_TIME_BUDGET)
+        if isinstance(time_budget, bool) or not math.isfinite(float(time_budget)):
+            raise ValueError("time_budget debe ser un número finito")
+        time_budget = min(float(time_budget), OPTIMIZER_MAX_TIME_BUDGET)
+        result = optimizar_diseno(
+            bounds,
+            base=base,
+            objetivo=data.get("objective", "perdidas"),
+            corriente_maxima=data.get("max_current"),
+            tiempo_limite=time_budget,
+        )
+    except (AttributeError, TypeError, ValueError) as exc:
+        return _api_error(400, "OPTIMIZATION_ERROR", "Error de optimización", str(exc))
+    except Exception:
+        logger.exception(
+            "Error en API optimize",
+            extra={"method": request.method, "path": request.path, "query": request.query_string.decode("utf-8")},
+        )
+        return _api_error(500, "INTERNAL_ERROR", "Error interno del servidor")
+
+    return jsonify({"success": True, **result})
+
+
 @api_bp.route("/example", methods=["GET"])
 def api_example():
     return jsonify(get_example_values())
@@ -87,6 +225,17 @@ def api_health():
     )
 
 
+@api_bp.route("/metrics", methods=["GET"])
+def api_metrics():
+    return jsonify(
+        {
+            "single_flight": {name: flight.stats() for name, flight in current_app.extensions["single_flight"].items()},
+            "live_streams": current_app.extensions["live_stream"].active(),
+            "admission": current_app.extensions["admission"].stats() if "admission" in current_app.extensions else None,
+        }
+    )
+
+
 @api_bp.route("/version", methods=["GET"])
 def api_version():
     version = os.environ.get("APP_VERSION", "dev")
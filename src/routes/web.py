@@ -1,7 +1,10 @@
+import io
 import logging
+from typing import Dict, Optional, Tuple
 
-from flask import Blueprint, abort, render_template, request, send_file
+from flask import Blueprint, abort, current_app, render_template, request, send_file
 
+from src.config import REQUIRED_PARAMS, SINGLE_FLIGHT_TIMEOUT
 from src.services.circuit_renderer import dibujar_circuito
 from src.services.mesh_analyzer import MeshAnalyzer, get_default_values
 from src.validators.inputs import parse_form_data, validate_parameters
@@ -57,8 +60,8 @@ def home():
     return render_template("index.html", **template_data)
 
 
-@web_bp.route("/circuito.png")
-def circuito_png():
+def _circuito_params() -> Dict[str, float]:
+    """Valores de la query string de /circuito.png sobre los predeterminados, sin validar rangos."""
     vals = get_default_values()
     for key in vals.keys():
         val = request.args.get(key)
@@ -66,12 +69,32 @@ def circuito_png():
             try:
                 vals[key] = float(val.replace(",", "."))
             except ValueError:
-                abort(400, description=f"{key}: Debe ser un número válido")
+                raise ValueError(f"{key}: Debe ser un número válido")
+    return vals
+
 
+def circuito_flight_key() -> Optional[Tuple[float, ...]]:
+    """Clave de agrupación de la petición actual a /circuito.png, o None si la query string no es válida."""
     try:
+        vals = _circuito_params()
+    except ValueError:
+        return None
+    return tuple(vals[key] for key in REQUIRED_PARAMS)
+
+
+@web_bp.route("/circuito.png")
+def circuito_png():
+    try:
+        vals = _circuito_params()
         validate_parameters(vals)
     except ValueError as exc:
         abort(400, description=str(exc))
 
-    buf = dibujar_circuito(vals)
-    return send_file(buf, mimetype="image/png")
+    flight_key = tuple(vals[key] for key in REQUIRED_PARAMS)
+    try:
+        png = current_app.extensions["single_flight"]["circuito"].do(
+            flight_key, lambda: dibujar_circuito(vals).getvalue(), timeout=SINGLE_FLIGHT_TIMEOUT
+        )
+    except TimeoutError as exc:
+        abort(503, description=str(exc))
+    return send_file(io.BytesIO(png), mimetype="image/png")
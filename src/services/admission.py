@@ -0,0 +1,125 @@
+import threading
+from typing import Callable, Dict, Hashable, Mapping, Optional, Tuple
+
+from flask import Flask, g, jsonify, request
+
+from src.services.single_flight import SingleFlight
+
+
+class CostClass:
+    """Límite de concurrencia con una cola de espera corta y acotada."""
+
+    def __init__(self, limit: int, queue: int, wait: float) -> None:
+        self.limit = limit
+        self.queue = queue
+        self.wait = wait
+        self._cond = threading.Condition()
+        self._active = 0
+        self._waiting = 0
+        self._stats = {"admitted": 0, "rejected": 0, "timeouts": 0}
+
+    def acquire(self) -> Optional[str]:
+        """Devuelve None si la petición entra, o el motivo del rechazo ("queue_full" o "timeout")."""
+        with self._cond:
+            if self._active >= self.limit:
+                if self._waiting >= self.queue:
+                    self._stats["rejected"] += 1
+                    return "queue_full"
+                self._waiting += 1
+                try:
+                    admitted = self._cond.wait_for(lambda: self._active < self.limit, self.wait)
+                finally:
+                    self._waiting -= 1
+                if not admitted:
+                    self._stats["timeouts"] += 1
+                    return "timeout"
+            self._active += 1
+            self._stats["admitted"] += 1
+            return None
+
+    def release(self) -> None:
+        with self._cond:
+            self._active -= 1
+            self._cond.notify()
+
+    def stats(self) -> Dict[str, int]:
+        with self._cond:
+            return {**self._stats, "active": self._active, "waiting": self._waiting, "limit": self.limit}
+
+
+class AdmissionController:
+    """Asigna cada endpoint a una clase de coste y rechaza rápido lo que excede su capacidad.
+
+    Los endpoints sin clase (health, metrics, estáticos...) nunca pasan por los límites.
+    En los endpoints de `coalesced`, una petición cuya clave ya se está calculando no ocupa cupo:
+    solo espera el resultado del líder, que ya fue admitido.
+    Los streams SSE conservan su cupo hasta que se cierra el cuerpo, no solo hasta que termina
+    la vista; el resto lo libera en el teardown. No se usa `is_streamed` porque `send_file` también
+    lo activa y, con `direct_passthrough`, werkzeug nunca llama a sus callbacks de cierre.
+    """
+
+    def __init__(
+        self,
+        classes: Mapping[str, Mapping],
+        routes: Mapping[str, str],
+        retry_after: int,
+        coalesced: Optional[Mapping[str, Tuple[SingleFlight, Callable[[], Optional[Hashable]]]]] = None,
+    ) -> None:
+        self.classes = {name: CostClass(**options) for name, options in classes.items()}
+        self.routes = dict(routes)
+        self.retry_after = retry_after
+        self.coalesced = dict(coalesced or {})
+
+    def init_app(self, app: Flask) -> None:
+        app.extensions["admission"] = self
+        app.before_request(self._before_request)
+        app.after_request(self._after_request)
+        app.teardown_request(self._teardown_request)
+
+    def _before_request(self):
+        cost_class = self.classes.get(self.routes.get(request.endpoint))
+        if cost_class is None or self._joins_flight_in_progress():
+            return None
+
+        reason = cost_class.acquire()
+        if reason is None:
+            g.admission_class = cost_class
+            return None
+
+        status = 429 if reason == "queue_full" else 503
+        response = jsonify(
+            {
+                "success": False,
+                "error": {
+                    "code": "OVERLOADED",
+                    "message": "Servidor ocupado, reintenta en unos segundos",
+                    "details": reason,
+                },
+            }
+        )
+        response.status_code = status
+        response.headers["Retry-After"] = str(self.retry_after)
+        return response
+
+    def _joins_flight_in_progress(self) -> bool:
+        # Si el líder termina entre esta comprobación y `do`, la petición calcula sin cupo; es a lo sumo
+        # un cálculo extra por clave, a cambio de no bloquear a los seguidores detrás de la cola.
+        flight = self.coalesced.get(request.endpoint)
+        if flight is None:
+            return False
+        single_flight, flight_key = flight
+        key = flight_key()
+        return key is not None and single_flight.in_flight(key)
+
+    def _after_request(self, response):
+        if response.mimetype == "text/event-stream" and "admission_class" in g:
+            response.call_on_close(g.pop("admission_class").release)
+        return response
+
+    def _teardown_request(self, exc) -> None:
+        cost_class = g.pop("admission_class", None)
+        if cost_class is not None:
+            cost_class.release()
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        return {name: cost_class.stats() for name, cost_class in self.classes.items()}
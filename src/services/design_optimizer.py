@@ -0,0 +1,288 @@
+import logging
+import time
+from typing import Dict, List, Optional, Tuple, Union
+
+import numpy as np
+
+from src.config import (
+    OPTIMIZER_BATCH_SIZE,
+    OPTIMIZER_CANDIDATE_POOL_FACTOR,
+    OPTIMIZER_DEDUP_RTOL,
+    OPTIMIZER_DEFAULT_TIME_BUDGET,
+    OPTIMIZER_GRID_POINTS,
+    OPTIMIZER_OBJECTIVES,
+    OPTIMIZER_REFINE_ITERATIONS,
+    OPTIMIZER_TOP_K,
+    RESISTANCE_RANGE,
+)
+from src.services.mesh_analyzer import (
+    INCIDENCIA_RAMAS,
+    MESH_KEYS,
+    RESISTANCE_KEYS,
+    VOLTAGE_KEYS,
+    MeshAnalyzer,
+    get_default_values,
+)
+from src.validators.inputs import validate_parameters
+
+logger = logging.getLogger(__name__)
+
+# Fracción del presupuesto de tiempo reservada para la búsqueda en rejilla; el resto es para el refinamiento.
+GRID_TIME_FRACTION = 0.7
+
+
+def _normalizar_limites(limites: Dict[str, Tuple[float, float]]) -> Tuple[List[int], np.ndarray, np.ndarray]:
+    if not limites:
+        raise ValueError("Debe indicar al menos una resistencia a optimizar")
+
+    min_val, max_val = RESISTANCE_RANGE
+    indices, bajos, altos = [], [], []
+    for key, rango in limites.items():
+        if key not in RESISTANCE_KEYS:
+            raise ValueError(f"{key}: Solo se pueden optimizar resistencias (R1..R6)")
+        try:
+            bajo, alto = (float(v) for v in rango)
+        except (TypeError, ValueError):
+            raise ValueError(f"{key}: Los límites deben ser un par [mínimo, máximo] numérico")
+        if not (min_val <= bajo <= alto <= max_val):
+            raise ValueError(f"{key}: Los límites deben cumplir {min_val}Ω <= mínimo <= máximo <= {max_val}Ω")
+        indices.append(RESISTANCE_KEYS.index(key))
+        bajos.append(bajo)
+        altos.append(alto)
+
+    return indices, np.array(bajos), np.array(altos)
+
+
+def _normalizar_corriente_maxima(corriente_maxima: Union[None, float, Dict[str, float]]) -> np.ndarray:
+    if corriente_maxima is None:
+        return np.full(3, np.inf)
+    # bool es subclase de int: True se tomaría en silencio como un límite de 1 A.
+    valores_dados = corriente_maxima.values() if isinstance(corriente_maxima, dict) else [corriente_maxima]
+    if any(isinstance(valor, bool) for valor in valores_dados):
+        raise ValueError("La corriente máxima por malla debe ser numérica")
+    if isinstance(corriente_maxima, dict):
+        desconocidas = [key for key in corriente_maxima if key not in MESH_KEYS]
+        if desconocidas:
+            raise ValueError(f"Mallas desconocidas en corriente máxima: {desconocidas}")
+        valores = np.array([float(corriente_maxima.get(key, np.inf)) for key in MESH_KEYS])
+    else:
+        valores = np.full(3, float(corriente_maxima))
+    if np.any(np.isnan(valores)) or np.any(valores <= 0):
+        raise ValueError("La corriente máxima por malla debe ser positiva")
+    return valores
+
+
+def _evaluar(
+    R: np.ndarray, V: np.ndarray, objetivo: str, corriente_maxima: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    corrientes = MeshAnalyzer.calcular_corrientes_lote(R, V)
+    if objetivo == "perdidas":
+        valor = np.sum(R * MeshAnalyzer.corrientes_de_rama(corrientes) ** 2, axis=1)
+    else:
+        valor = np.max(np.abs(corrientes), axis=1)
+    factible = np.all(np.abs(corrientes) <= corriente_maxima, axis=1)
+    return corrientes, valor, factible
+
+
+def _gradiente(R: np.ndarray, V: np.ndarray, corrientes: np.ndarray, objetivo: str) -> np.ndarray:
+    """Gradiente analítico del objetivo respecto a R1..R6, forma (N, 6).
+
+    Como dA/dRk = a_k a_k^T, se cumple dI/dRk = -A^-1 a_k (a_k . I).
+    """
+    A, _ = MeshAnalyzer.construir_sistema_lote(R, V)
+    ramas = MeshAnalyzer.corrientes_de_rama(corrientes)
+    if objetivo == "perdidas":
+        # P = I^T A I = I^T B, por lo que dP/dRk = -(a_k . I)^2
+        return -(ramas**2)
+
+    A_inv_a = np.linalg.solve(A, np.broadcast_to(INCIDENCIA_RAMAS.T, A.shape[:1] + INCIDENCIA_RAMAS.T.shape))
+    dI_dR = -A_inv_a * ramas[:, None, :]
+    pico = np.argmax(np.abs(corrientes), axis=1)
+    filas = np.arange(len(R))
+    return np.sign(corrientes[filas, pico])[:, None] * dI_dR[filas, pico, :]
+
+
+def _busqueda_rejilla(
+    base_R: np.ndarray,
+    V: np.ndarray,
+    indices: List[int],
+    rejillas: List[np.ndarray],
+    objetivo: str,
+    corriente_maxima: np.ndarray,
+    mejores: int,
+    tamano_lote: int,
+    fin: float,
+) -> Tuple[np.ndarray, np.ndarray, int, bool]:
+    forma = tuple(len(r) for r in rejillas)
+    total = int(np.prod(forma))
+    mejores_R = np.empty((0, 6))
+    mejores_valor = np.empty(0)
+    evaluados = 0
+
+    for inicio in range(0, total, tamano_lote):
+        if time.monotonic() >= fin and evaluados > 0:
+            break
+        posiciones = np.unravel_index(np.arange(inicio, min(inicio + tamano_lote, total)), forma)
+        R = np.tile(base_R, (len(posiciones[0]), 1))
+        for columna, rejilla, posicion in zip(indices, rejillas, posiciones):
+            R[:, columna] = rejilla[posicion]
+
+        _, valor, factible = _evaluar(R, np.broadcast_to(V, (len(R), 3)), objetivo, corriente_maxima)
+        evaluados += len(R)
+
+        mejores_R = np.concatenate([mejores_R, R[factible]])
+        mejores_valor = np.concatenate([mejores_valor, valor[factible]])
+        if len(mejores_valor) > mejores:
+            seleccion = np.argpartition(mejores_valor, mejores)[:mejores]
+            mejores_R, mejores_valor = mejores_R[seleccion], mejores_valor[seleccion]
+
+    return mejores_R, mejores_valor, evaluados, evaluados == total
+
+
+def _refinar(
+    R: np.ndarray,
+    V: np.ndarray,
+    indices: List[int],
+    bajos: np.ndarray,
+    altos: np.ndarray,
+    objetivo: str,
+    corriente_maxima: np.ndarray,
+    iteraciones: int,
+    paso_inicial: float,
+    fin: float,
+) -> np.ndarray:
+    """Descenso por gradiente proyectado en escala logarítmica, con búsqueda de paso que mantiene factibilidad."""
+    V = np.broadcast_to(V, (len(R), 3))
+    log_bajos, log_altos = np.log(bajos), np.log(altos)
+    paso = np.full(len(R), paso_inicial)
+    corrientes, valor, _ = _evaluar(R, V, objetivo, corriente_maxima)
+
+    for _ in range(iteraciones):
+        if time.monotonic() >= fin or not np.any(paso > 1e-6):
+            break
+        # Derivada respecto a log(Rk): Rk * df/dRk
+        gradiente = (_gradiente(R, V, corrientes, objetivo) * R)[:, indices]
+        escala = np.max(np.abs(gradiente), axis=1, keepdims=True)
+        direccion = np.divide(gradiente, escala, out=np.zeros_like(gradiente), where=escala > 0)
+
+        candidato = R.copy()
+        candidato[:, indices] = np.exp(np.clip(np.log(R[:, indices]) - paso[:, None] * direccion, log_bajos, log_altos))
+        nuevas, nuevo_valor, factible = _evaluar(candidato, V, objetivo, corriente_maxima)
+        mejora = factible & (nuevo_valor < valor)
+
+        R[mejora] = candidato[mejora]
+        corrientes[mejora] = nuevas[mejora]
+        valor[mejora] = nuevo_valor[mejora]
+        paso = np.where(mejora, paso * 1.5, paso * 0.5)
+
+    return R
+
+
+def _distintos(R: np.ndarray, valor: np.ndarray, cantidad: int) -> np.ndarray:
+    """Índices de hasta `cantidad` filas de R, en orden de `valor`, sin diseños repetidos."""
+    elegidos: List[int] = []
+    for fila in np.argsort(valor, kind="stable"):
+        if not any(np.allclose(R[fila], R[otra], rtol=OPTIMIZER_DEDUP_RTOL, atol=0) for otra in elegidos):
+            elegidos.append(int(fila))
+            if len(elegidos) == cantidad:
+                break
+    return np.array(elegidos, dtype=int)
+
+
+def optimizar_diseno(
+    limites: Dict[str, Tuple[float, float]],
+    base: Optional[Dict[str, float]] = None,
+    objetivo: str = "perdidas",
+    corriente_maxima: Union[None, float, Dict[str, float]] = None,
+    puntos_por_eje: int = OPTIMIZER_GRID_POINTS,
+    mejores: int = OPTIMIZER_TOP_K,
+    tiempo_limite: float = OPTIMIZER_DEFAULT_TIME_BUDGET,
+    tamano_lote: int = OPTIMIZER_BATCH_SIZE,
+    iteraciones_refinamiento: int = OPTIMIZER_REFINE_ITERATIONS,
+) -> Dict:
+    """Busca valores de R1..R6 dentro de `limites` que minimicen `objetivo`.
+
+    Primero evalúa por lotes una rejilla logarítmica y luego refina los mejores
+    candidatos factibles con gradientes analíticos, sin exceder `tiempo_limite`.
+    """
+    if objetivo not in OPTIMIZER_OBJECTIVES:
+        raise ValueError(f"Objetivo desconocido: {objetivo}. Opciones: {list(OPTIMIZER_OBJECTIVES)}")
+    if puntos_por_eje < 2:
+        raise ValueError("La rejilla necesita al menos 2 puntos por eje")
+    if mejores < 1 or tamano_lote < 1:
+        raise ValueError("La cantidad de diseños y el tamaño de lote deben ser positivos")
+    if isinstance(tiempo_limite, bool) or not np.isfinite(tiempo_limite) or tiempo_limite <= 0:
+        raise ValueError("El presupuesto de tiempo debe ser un número positivo y finito")
+
+    params = get_default_values()
+    params.update(base or {})
+    validate_parameters(params)
+    indices, bajos, altos = _normalizar_limites(limites)
+    limite_corriente = _normalizar_corriente_maxima(corriente_maxima)
+
+    inicio = time.monotonic()
+    fin = inicio + tiempo_limite
+    base_R = np.array([params[key] for key in RESISTANCE_KEYS], dtype=np.float64)
+    V = np.array([params[key] for key in VOLTAGE_KEYS], dtype=np.float64)
+    rejillas = [np.geomspace(bajo, alto, puntos_por_eje) for bajo, alto in zip(bajos, altos)]
+
+    reserva, valor_reserva, evaluados, completo = _busqueda_rejilla(
+        base_R,
+        V,
+        indices,
+        rejillas,
+        objetivo,
+        limite_corriente,
+        mejores * OPTIMIZER_CANDIDATE_POOL_FACTOR,
+        tamano_lote,
+        inicio + tiempo_limite * GRID_TIME_FRACTION,
+    )
+
+    disenos = []
+    if len(reserva):
+        orden = np.argsort(valor_reserva, kind="stable")
+        reserva = reserva[orden]
+        paso_inicial = float(np.max(np.log(altos / bajos))) / (puntos_por_eje - 1) if np.any(altos > bajos) else 0.0
+        refinados = _refinar(
+            reserva[:mejores].copy(),
+            V,
+            indices,
+            bajos,
+            altos,
+            objetivo,
+            limite_corriente,
+            iteraciones_refinamiento,
+            paso_inicial,
+            fin,
+        )
+        # Los candidatos refinados suelen converger al mismo óptimo: se eliminan duplicados
+        # y los huecos se rellenan con los siguientes mejores puntos de la rejilla.
+        candidatos = np.concatenate([refinados, reserva[mejores:]])
+        _, valor, _ = _evaluar(candidatos, np.broadcast_to(V, (len(candidatos), 3)), objetivo, limite_corriente)
+        candidatos = candidatos[_distintos(candidatos, valor, mejores)]
+        corrientes, valor, _ = _evaluar(
+            candidatos, np.broadcast_to(V, (len(candidatos), 3)), objetivo, limite_corriente
+        )
+        perdidas = np.sum(candidatos * MeshAnalyzer.corrientes_de_rama(corrientes) ** 2, axis=1)
+        for fila in np.argsort(valor, kind="stable"):
+            diseno = dict(params)
+            diseno.update({key: float(candidatos[fila, i]) for i, key in enumerate(RESISTANCE_KEYS)})
+            disenos.append(
+                {
+                    "params": diseno,
+                    "currents": {key: float(corrientes[fila, i]) for i, key in enumerate(MESH_KEYS)},
+                    "objective": float(valor[fila]),
+                    "losses": float(perdidas[fila]),
+                    "peak_current": float(np.max(np.abs(corrientes[fila]))),
+                }
+            )
+    else:
+        logger.info("Optimización sin diseños factibles tras evaluar %d candidatos", evaluados)
+
+    return {
+        "objective": objetivo,
+        "designs": disenos,
+        "evaluated": evaluados,
+        "grid_complete": completo,
+        "elapsed": time.monotonic() - inicio,
+    }
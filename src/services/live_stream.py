@@ -0,0 +1,138 @@
+import json
+import threading
+import time
+import uuid
+from typing import Any, Callable, Dict, Iterator, Optional
+
+MAX_DEBOUNCE_FACTOR = 4
+
+
+class _Stream:
+    def __init__(self, params: Dict[str, float]) -> None:
+        self.cond = threading.Condition()
+        self.params = params
+        # La versión inicial es 1 para que el estado de partida se calcule al conectar.
+        self.version = 1
+        self.closed = False
+        # Último cambio de estado o resultado enviado; sirve para expirar streams inactivos
+        # aunque su generador nunca haya llegado a ejecutarse.
+        self.last_activity = time.monotonic()
+
+
+def _sse(event: str, data: Any) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+class LiveStreamHub:
+    """Streams SSE por cliente que recalculan solo el último estado recibido.
+
+    Cada stream guarda únicamente el último diccionario de parámetros y un contador de versión,
+    de modo que la memoria por conexión no crece con la cantidad de actualizaciones.
+    Mientras no hay cambios el generador duerme en una `Condition` sin consumir CPU.
+    El número de streams abiertos lo limita la clase de admisión `stream`, no el hub.
+    """
+
+    def __init__(self, debounce: float, heartbeat: float, idle_timeout: float) -> None:
+        self.debounce = debounce
+        self.max_delay = debounce * MAX_DEBOUNCE_FACTOR
+        self.heartbeat = heartbeat
+        self.idle_timeout = idle_timeout
+        self._lock = threading.Lock()
+        self._streams: Dict[str, _Stream] = {}
+
+    def open(self, params: Dict[str, float]) -> str:
+        """Registra un stream con `params` como estado inicial y devuelve su id."""
+        self._expire_idle()
+        with self._lock:
+            stream_id = uuid.uuid4().hex
+            self._streams[stream_id] = _Stream(dict(params))
+        return stream_id
+
+    def _expire_idle(self) -> None:
+        now = time.monotonic()
+        with self._lock:
+            expired = [sid for sid, stream in self._streams.items() if now - stream.last_activity >= self.idle_timeout]
+        for stream_id in expired:
+            self.close(stream_id)
+
+    def _get(self, stream_id: str) -> Optional[_Stream]:
+        with self._lock:
+            return self._streams.get(stream_id)
+
+    def current(self, stream_id: str) -> Optional[Dict[str, float]]:
+        stream = self._get(stream_id)
+        if stream is None:
+            return None
+        with stream.cond:
+            return dict(stream.params)
+
+    def update(self, stream_id: str, params: Dict[str, float]) -> bool:
+        """Reemplaza el estado pendiente del stream; las actualizaciones intermedias se descartan."""
+        self._expire_idle()
+        stream = self._get(stream_id)
+        if stream is None:
+            return False
+        with stream.cond:
+            stream.params = dict(params)
+            stream.version += 1
+            stream.last_activity = time.monotonic()
+            stream.cond.notify()
+        return True
+
+    def close(self, stream_id: str) -> None:
+        with self._lock:
+            stream = self._streams.pop(stream_id, None)
+        if stream is not None:
+            with stream.cond:
+                stream.closed = True
+                stream.cond.notify()
+
+    def active(self) -> int:
+        with self._lock:
+            return len(self._streams)
+
+    def events(self, stream_id: str, compute: Callable[[Dict[str, float]], Dict[str, Any]]) -> Iterator[str]:
+        """Genera eventos SSE `ready`, `result` y `calculation_error` hasta que el stream se cierre o quede inactivo."""
+        stream = self._get(stream_id)
+        if stream is None:
+            return
+
+        sent = 0
+        try:
+            yield _sse("ready", {"stream_id": stream_id})
+            while True:
+                with stream.cond:
+                    if stream.version == sent and not stream.closed:
+                        stream.cond.wait(self.heartbeat)
+                    if stream.closed:
+                        return
+                    if stream.version == sent:
+                        if time.monotonic() - stream.last_activity >= self.idle_timeout:
+                            return
+                        params = None
+                    else:
+                        # Debounce: esperar a que no lleguen más cambios durante `debounce` segundos,
+                        # sin pasar de `max_delay` para que un arrastre continuo siga mostrando resultados.
+                        deadline = time.monotonic() + self.max_delay
+                        while not stream.closed:
+                            version = stream.version
+                            timeout = min(self.debounce, deadline - time.monotonic())
+                            if timeout <= 0 or not stream.cond.wait_for(
+                                lambda: stream.version != version or stream.closed, timeout
+                            ):
+                                break
+                        if stream.closed:
+                            return
+                        params, sent = stream.params, stream.version
+                        stream.last_activity = time.monotonic()
+
+                if params is None:
+                    yield ": ping\n\n"
+                    continue
+
+                try:
+                    yield _sse("result", compute(params))
+                except (ValueError, TimeoutError) as exc:
+                    yield _sse("calculation_error", {"message": str(exc)})
+        finally:
+            self.close(stream_id)
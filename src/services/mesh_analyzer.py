@@ -1,5 +1,6 @@
 import logging
-from typing import Dict, Tuple
+from itertools import combinations
+from typing import Dict, List, Tuple
 
 import numpy as np
 
@@ -7,12 +8,64 @@ from src.config import (
     DEFAULT_VALUES,
     EXAMPLE_VALUES,
     HIGH_CURRENT_WARNING_THRESHOLD,
+    ILL_CONDITIONED_THRESHOLD,
+    MIXED_PRECISION_FALLBACK_CONDITION,
+    MIXED_PRECISION_REFINEMENT_STEPS,
+    PRECISION_POLICIES,
     SINGULAR_MATRIX_TOLERANCE,
 )
 from src.validators.inputs import validate_parameters
 
 logger = logging.getLogger(__name__)
 
+RESISTANCE_KEYS = ("R1", "R2", "R3", "R4", "R5", "R6")
+VOLTAGE_KEYS = ("V1", "V2", "V3")
+MESH_KEYS = ("I1", "I2", "I3")
+
+# Fila k: mallas que recorre la rama Rk (con signo). A = sum_k Rk * a_k a_k^T
+INCIDENCIA_RAMAS = np.array(
+    [
+        [1.0, 0.0, 0.0],
+        [0.0, 1.0, 0.0],
+        [0.0, 0.0, 1.0],
+        [1.0, -1.0, 0.0],
+        [0.0, 1.0, -1.0],
+        [1.0, 0.0, -1.0],
+    ],
+    dtype=np.float64,
+)
+
+
+def _inversa_simetrica(R: np.ndarray, dtype) -> Tuple[Tuple[np.ndarray, ...], np.ndarray]:
+    """Inversa cerrada de la matriz simétrica de mallas (N, 3, 3) sin materializarla.
+
+    Devuelve los 6 elementos únicos de A^-1 y el número de condición relativo ||A||_1 * ||A^-1||_1.
+    """
+    R = np.asarray(R, dtype=dtype)
+    R1, R2, R3, R4, R5, R6 = (R[:, k] for k in range(6))
+    a, b, c = R1 + R4 + R6, R2 + R4 + R5, R3 + R5 + R6
+    d, e, f = -R4, -R6, -R5
+
+    c00, c11, c22 = b * c - f * f, a * c - e * e, a * b - d * d
+    c01, c02, c12 = e * f - d * c, d * f - b * e, d * e - a * f
+    with np.errstate(divide="ignore", invalid="ignore"):
+        inv_det = 1 / (a * c00 + d * c01 + e * c02)
+    inversa = tuple(x * inv_det for x in (c00, c11, c22, c01, c02, c12))
+
+    norma_A = np.maximum.reduce([abs(a) + abs(d) + abs(e), abs(d) + abs(b) + abs(f), abs(e) + abs(f) + abs(c)])
+    i00, i11, i22, i01, i02, i12 = (abs(x) for x in inversa)
+    norma_inv = np.maximum.reduce([i00 + i01 + i02, i01 + i11 + i12, i02 + i12 + i22])
+    condicion = np.nan_to_num(norma_A.astype(np.float64) * norma_inv, nan=np.inf)
+    return inversa, condicion
+
+
+def _aplicar_inversa(inversa: Tuple[np.ndarray, ...], B: np.ndarray) -> np.ndarray:
+    i00, i11, i22, i01, i02, i12 = inversa
+    b0, b1, b2 = (B[:, k].astype(i00.dtype, copy=False) for k in range(3))
+    return np.stack(
+        [i00 * b0 + i01 * b1 + i02 * b2, i01 * b0 + i11 * b1 + i12 * b2, i02 * b0 + i12 * b1 + i22 * b2], axis=1
+    )
+
 
 class MeshAnalyzer:
     """Clase para el análisis de circuitos de mallas residenciales."""
@@ -67,6 +120,109 @@ class MeshAnalyzer:
         except Exception as exc:
             raise ValueError(f"Error inesperado en el cálculo: {str(exc)}")
 
+    @staticmethod
+    def construir_sistema_lote(R: np.ndarray, V: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Construye las matrices A (N, 3, 3) y B (N, 3) para un lote de circuitos.
+
+        R tiene forma (N, 6) con R1..R6 y V forma (N, 3) con V1..V3.
+        """
+        R = np.asarray(R, dtype=np.float64)
+        V = np.asarray(V, dtype=np.float64)
+        A = np.einsum("nk,ki,kj->nij", R, INCIDENCIA_RAMAS, INCIDENCIA_RAMAS)
+        return A, V.copy()
+
+    @staticmethod
+    def calcular_corrientes_lote(R: np.ndarray, V: np.ndarray, precision: str = "float64") -> np.ndarray:
+        """Resuelve un lote de circuitos sin validar y devuelve las corrientes (N, 3).
+
+        Atajo de `resolver_lote` que descarta la máscara de mal condicionamiento.
+        """
+        return MeshAnalyzer.resolver_lote(R, V, precision)[0]
+
+    @staticmethod
+    def resolver_lote(R: np.ndarray, V: np.ndarray, precision: str = "float64") -> Tuple[np.ndarray, np.ndarray]:
+        """Resuelve un lote y devuelve (corrientes (N, 3), máscara (N,) de filas mal condicionadas).
+
+        Ambas políticas usan la inversa cerrada de la matriz simétrica 3x3. Con precision="mixta" se invierte
+        en float32 y se refina el residuo en float64; las filas cuyo condicionamiento supera
+        MIXED_PRECISION_FALLBACK_CONDITION se re-resuelven (y se re-estiman) en float64.
+        El condicionamiento es relativo (||A||_1 * ||A^-1||_1), así que no depende de la escala de R.
+        """
+        if precision not in PRECISION_POLICIES:
+            raise ValueError(f"Precisión desconocida: {precision}. Opciones: {list(PRECISION_POLICIES)}")
+
+        R = np.asarray(R, dtype=np.float64)
+        V = np.asarray(V, dtype=np.float64)
+        if precision == "float64":
+            inversa, condicion = _inversa_simetrica(R, np.float64)
+            return _aplicar_inversa(inversa, V), condicion > ILL_CONDITIONED_THRESHOLD
+
+        inversa, condicion = _inversa_simetrica(R, np.float32)
+        corrientes = _aplicar_inversa(inversa, V).astype(np.float64)
+        for _ in range(MIXED_PRECISION_REFINEMENT_STEPS):
+            # Residuo en float64 sin formar A: A x = sum_k Rk a_k (a_k . x)
+            residuo = V - (R * MeshAnalyzer.corrientes_de_rama(corrientes)) @ INCIDENCIA_RAMAS
+            corrientes += _aplicar_inversa(inversa, residuo)
+
+        respaldo = condicion > MIXED_PRECISION_FALLBACK_CONDITION
+        if np.any(respaldo):
+            # En float32 los cofactores se cancelan cuando el condicionamiento es alto: tanto la solución
+            # como la estimación de condicionamiento de estas filas se recalculan en float64.
+            inversa, condicion[respaldo] = _inversa_simetrica(R[respaldo], np.float64)
+            corrientes[respaldo] = _aplicar_inversa(inversa, V[respaldo])
+        return corrientes, condicion > ILL_CONDITIONED_THRESHOLD
+
+    @staticmethod
+    def corrientes_de_rama(corrientes: np.ndarray) -> np.ndarray:
+        """Convierte corrientes de malla (..., 3) en corrientes de rama (..., 6) para R1..R6."""
+        return corrientes @ INCIDENCIA_RAMAS.T
+
+    @staticmethod
+    def analizar_contingencias(params: Dict[str, float], dobles: bool = False) -> Dict:
+        """Análisis N-1 (y opcionalmente N-2): abre cada rama R1..R6 o anula cada fuente V1..V3.
+
+        Todas las contingencias se derivan de la inversa del sistema base: anular una fuente cambia
+        solo B, y abrir ramas (Rk -> infinito) es el límite de Woodbury de una actualización de rango
+        bajo, que impone a_k . I = 0. Los casos se resuelven por lotes según el número de ramas abiertas.
+        """
+        I1, I2, I3, A, B = MeshAnalyzer.calcular_corrientes(*(params[key] for key in RESISTANCE_KEYS + VOLTAGE_KEYS))
+        A_inv = np.linalg.inv(A)
+        elementos = RESISTANCE_KEYS + VOLTAGE_KEYS
+        casos: List[Tuple[str, ...]] = [(elemento,) for elemento in elementos]
+        if dobles:
+            casos += list(combinations(elementos, 2))
+
+        B_casos = np.tile(B, (len(casos), 1))
+        for fila, caso in enumerate(casos):
+            for elemento in caso:
+                if elemento in VOLTAGE_KEYS:
+                    B_casos[fila, VOLTAGE_KEYS.index(elemento)] = 0.0
+        corrientes = B_casos @ A_inv
+
+        abiertas = [[RESISTANCE_KEYS.index(e) for e in caso if e in RESISTANCE_KEYS] for caso in casos]
+        for rango in (1, 2):
+            filas = np.array([fila for fila, ramas in enumerate(abiertas) if len(ramas) == rango], dtype=int)
+            if not len(filas):
+                continue
+            U = INCIDENCIA_RAMAS[np.array([abiertas[fila] for fila in filas])].transpose(0, 2, 1)
+            W = A_inv @ U
+            G = U.transpose(0, 2, 1) @ W
+            restriccion = U.transpose(0, 2, 1) @ corrientes[filas, :, None]
+            corrientes[filas] -= (W @ np.linalg.solve(G, restriccion))[..., 0]
+
+        peor = np.argmax(np.abs(corrientes), axis=0)
+        return {
+            "base": {"I1": I1, "I2": I2, "I3": I3},
+            "cases": [
+                {"outage": list(caso), "currents": dict(zip(MESH_KEYS, map(float, corrientes[fila])))}
+                for fila, caso in enumerate(casos)
+            ],
+            "worst_case": {
+                malla: {"current": float(corrientes[peor[j], j]), "outage": list(casos[peor[j]])}
+                for j, malla in enumerate(MESH_KEYS)
+            },
+        }
+
     @staticmethod
     def interpretar_corrientes(I1: float, I2: float, I3: float) -> Dict[str, str]:
         interpretaciones: Dict[str, str] = {}
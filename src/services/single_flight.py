@@ -0,0 +1,68 @@
+import threading
+from typing import Any, Callable, Dict, Hashable, Optional
+
+
+class _Call:
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """Agrupa llamadas concurrentes con la misma clave para que solo una ejecute el cálculo.
+
+    La primera llamada (líder) ejecuta `fn`; las que llegan mientras está en curso esperan y
+    comparten su resultado o su excepción. No se guarda nada una vez terminada la ejecución.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+        self._stats = {"executed": 0, "coalesced": 0, "errors": 0, "timeouts": 0}
+
+    def do(self, key: Hashable, fn: Callable[[], Any], timeout: Optional[float] = None) -> Any:
+        """Ejecuta `fn` o espera la ejecución en curso para `key`.
+
+        `timeout` solo aplica a quienes esperan: si vence se lanza TimeoutError, mientras que
+        el líder sigue calculando para el resto.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self._stats["executed"] += 1
+            else:
+                self._stats["coalesced"] += 1
+
+        if not leader:
+            if not call.done.wait(timeout):
+                with self._lock:
+                    self._stats["timeouts"] += 1
+                raise TimeoutError("Tiempo de espera agotado aguardando un cálculo en curso")
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as exc:
+            call.error = exc
+            with self._lock:
+                self._stats["errors"] += 1
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    def in_flight(self, key: Hashable) -> bool:
+        """Indica si hay una ejecución en curso para `key` a la que una nueva llamada se sumaría."""
+        with self._lock:
+            return key in self._calls
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {**self._stats, "in_flight": len(self._calls)}
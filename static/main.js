@@ -7,6 +7,17 @@
 
 // Variables globales
 let isCalculating = false;
+let liveSource = null;
+let liveStreamId = null;
+let livePending = false;
+let liveSending = false;
+let liveIdleTimer = null;
+let liveRetryAt = 0;
+
+// El stream se cierra tras este tiempo sin cambios, antes de que lo expire el servidor
+const LIVE_IDLE_MS = 20000;
+// Tras un error (servidor ocupado o caído) se usa solo el formulario durante este tiempo
+const LIVE_RETRY_MS = 30000;
 
 // Evento que se ejecuta al cargar la página
 document.addEventListener('DOMContentLoaded', function() {
@@ -16,6 +27,7 @@ document.addEventListener('DOMContentLoaded', function() {
     initializeFormValidation();
     initializeAnimations();
     initializeTooltips();
+    initializeLiveStream();
 
     const btnEjemplo = document.querySelector('#btn-ejemplo');
     if (btnEjemplo) {
@@ -50,6 +62,125 @@ function cargarEjemplo() {
         });
 }
 
+// Recálculo en vivo: el EventSource se abre con el primer cambio del formulario y se cierra
+// tras LIVE_IDLE_MS sin cambios, para no ocupar un hilo del servidor con pestañas inactivas.
+// El servidor agrupa los cambios y solo calcula el último estado.
+function initializeLiveStream() {
+    if (!window.EventSource || !document.querySelector('#resultados-en-vivo')) {
+        return;
+    }
+
+    document.querySelectorAll('input[type="number"]').forEach(input => {
+        input.addEventListener('input', function() {
+            livePending = true;
+            openLiveStream();
+            scheduleLiveIdleClose();
+            sendLiveUpdate();
+        });
+    });
+}
+
+function openLiveStream() {
+    if (liveSource || Date.now() < liveRetryAt) {
+        return;
+    }
+
+    liveSource = new EventSource('/api/stream?diagram=1');
+    liveSource.addEventListener('ready', function(e) {
+        liveStreamId = JSON.parse(e.data).stream_id;
+        // Sincronizar el stream con los valores actuales del formulario
+        livePending = true;
+        sendLiveUpdate();
+    });
+    liveSource.addEventListener('result', function(e) {
+        renderLiveResult(JSON.parse(e.data));
+    });
+    liveSource.addEventListener('calculation_error', function(e) {
+        showError(JSON.parse(e.data).message);
+    });
+    // Sin reconexión automática: ante un rechazo (429/503) o una caída se vuelve al formulario
+    liveSource.addEventListener('error', function() {
+        closeLiveStream();
+        liveRetryAt = Date.now() + LIVE_RETRY_MS;
+    });
+}
+
+function closeLiveStream() {
+    if (liveSource) {
+        liveSource.close();
+    }
+    clearTimeout(liveIdleTimer);
+    liveSource = null;
+    liveStreamId = null;
+}
+
+function scheduleLiveIdleClose() {
+    clearTimeout(liveIdleTimer);
+    liveIdleTimer = setTimeout(closeLiveStream, LIVE_IDLE_MS);
+}
+
+// Parámetros actuales del formulario, o null si algún campo es inválido
+function collectLiveParams() {
+    const params = {};
+    const inputs = document.querySelectorAll('input[type="number"]');
+
+    for (const input of inputs) {
+        const value = parseFloat(input.value);
+        if (input.value === '' || isNaN(value) || input.classList.contains('error')) {
+            return null;
+        }
+        params[input.getAttribute('name')] = value;
+    }
+    return params;
+}
+
+// Envía el último estado; mientras hay un envío en curso solo se marca como pendiente
+function sendLiveUpdate() {
+    if (!liveStreamId || liveSending || !livePending) {
+        return;
+    }
+
+    const params = collectLiveParams();
+    if (!params) {
+        return;
+    }
+
+    livePending = false;
+    liveSending = true;
+    fetch(`/api/stream/${liveStreamId}`, {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify(params)
+    })
+        .then(response => {
+            // El stream expiró en el servidor: se abre otro, que enviará el estado actual al recibir 'ready'
+            if (response.status === 404) {
+                closeLiveStream();
+                openLiveStream();
+                scheduleLiveIdleClose();
+            }
+        })
+        .catch(() => {})
+        .finally(() => {
+            liveSending = false;
+            sendLiveUpdate();
+        });
+}
+
+// Muestra las corrientes recibidas y actualiza el diagrama
+function renderLiveResult(data) {
+    const panel = document.querySelector('#resultados-en-vivo');
+    panel.hidden = false;
+    panel.querySelectorAll('[data-current]').forEach(item => {
+        item.textContent = data.interpretations[item.dataset.current];
+    });
+
+    const image = document.querySelector('#circuit-image');
+    if (image && data.diagram_url && !image.src.endsWith(data.diagram_url)) {
+        image.src = data.diagram_url;
+    }
+}
+
 // Validación en tiempo real del formulario
 function initializeFormValidation() {
     const inputs = document.querySelectorAll('input[type="number"]');
@@ -0,0 +1,156 @@
+import threading
+
+from src.app_factory import create_app
+from src.config import (
+    ADMISSION_CLASSES,
+    ADMISSION_RESERVED_THREADS,
+    DEFAULT_VALUES,
+    REQUIRED_PARAMS,
+    WORKER_THREADS,
+)
+from src.services.admission import CostClass
+
+
+def _app():
+    app = create_app()
+    app.config["TESTING"] = True
+    return app
+
+
+def test_cost_class_rejects_when_queue_is_full_and_times_out_waiters():
+    cost_class = CostClass(limit=1, queue=0, wait=0.01)
+    assert cost_class.acquire() is None
+    assert cost_class.acquire() == "queue_full"
+
+    cost_class.queue = 1
+    assert cost_class.acquire() == "timeout"
+
+    cost_class.release()
+    assert cost_class.acquire() is None
+    assert cost_class.stats() == {
+        "admitted": 2,
+        "rejected": 1,
+        "timeouts": 1,
+        "active": 1,
+        "waiting": 0,
+        "limit": 1,
+    }
+
+
+def test_cost_class_admits_waiter_when_slot_is_released():
+    cost_class = CostClass(limit=1, queue=1, wait=5.0)
+    cost_class.acquire()
+    threading.Timer(0.05, cost_class.release).start()
+
+    assert cost_class.acquire() is None
+
+
+def test_saturated_render_class_returns_429_with_retry_after():
+    app = _app()
+    render = app.extensions["admission"].classes["render"]
+    render.queue = 0
+    for _ in range(render.limit):
+        render.acquire()
+    client = app.test_client()
+
+    response = client.get("/circuito.png")
+
+    assert response.status_code == 429
+    assert response.headers["Retry-After"] == "1"
+    assert response.get_json()["error"]["code"] == "OVERLOADED"
+
+
+def test_saturated_render_class_does_not_block_other_classes_or_health():
+    app = _app()
+    render = app.extensions["admission"].classes["render"]
+    render.wait = 0.01
+    for _ in range(render.limit):
+        render.acquire()
+    client = app.test_client()
+
+    assert client.get("/circuito.png").status_code == 503
+    assert client.post("/api/calculate", json=DEFAULT_VALUES).status_code == 200
+    assert client.get("/api/health").status_code == 200
+    assert client.get("/api/metrics").status_code == 200
+
+
+def test_admitted_requests_release_their_slot():
+    app = _app()
+    client = app.test_client()
+
+    client.post("/api/calculate", json=DEFAULT_VALUES)
+    client.post("/api/calculate", json={"R1": 1})
+    stats = client.get("/api/metrics").get_json()["admission"]["compute"]
+
+    assert stats["admitted"] == 2
+    assert stats["active"] == 0
+
+
+def test_health_responds_while_streams_are_at_their_cap():
+    app = _app()
+    client = app.test_client()
+    limit = app.extensions["admission"].classes["stream"].limit
+
+    streams = [client.get("/api/stream", buffered=False) for _ in range(limit)]
+    rejected = client.get("/api/stream", buffered=False)
+    health = client.get("/api/health")
+    stats = app.extensions["admission"].stats()["stream"]
+    for response in streams:
+        response.close()
+
+    assert all(response.status_code == 200 for response in streams)
+    assert rejected.status_code == 429
+    assert rejected.headers["Retry-After"] == "1"
+    assert health.status_code == 200
+    assert stats["active"] == limit
+    assert app.extensions["admission"].stats()["stream"]["active"] == 0
+
+
+def test_sequential_renders_release_their_slot():
+    app = _app()
+    client = app.test_client()
+    render = app.extensions["admission"].classes["render"]
+
+    responses = [client.get("/circuito.png") for _ in range(render.limit + 2)]
+
+    assert all(response.status_code == 200 for response in responses)
+    assert render.stats()["active"] == 0
+
+
+def test_requests_joining_an_in_flight_render_skip_the_class_limit():
+    app = _app()
+    render = app.extensions["admission"].classes["render"]
+    render.queue = 0
+    for _ in range(render.limit):
+        render.acquire()
+    single_flight = app.extensions["single_flight"]["circuito"]
+    key = tuple(float(DEFAULT_VALUES[name]) for name in REQUIRED_PARAMS)
+    started, finish = threading.Event(), threading.Event()
+
+    def leader():
+        started.set()
+        finish.wait(5)
+        return b"png"
+
+    thread = threading.Thread(target=single_flight.do, args=(key, leader))
+    thread.start()
+    started.wait(5)
+    threading.Timer(0.1, finish.set).start()
+    client = app.test_client()
+
+    follower = client.get("/circuito.png")
+    other = client.get("/circuito.png?R1=7")
+    thread.join(5)
+
+    assert follower.status_code == 200
+    assert follower.data == b"png"
+    assert other.status_code == 429
+    assert single_flight.stats()["coalesced"] == 1
+    assert render.stats()["active"] == render.limit
+
+
+def test_admission_classes_leave_reserved_worker_threads():
+    in_use = sum(options["limit"] + options["queue"] for options in ADMISSION_CLASSES.values())
+
+    assert all(options["limit"] >= 1 for options in ADMISSION_CLASSES.values())
+    assert in_use <= WORKER_THREADS - ADMISSION_RESERVED_THREADS
@@ -1,3 +1,5 @@
+import json
+
 from src.app_factory import create_app
 from src.config import DEFAULT_VALUES
 
@@ -92,3 +94,143 @@ def test_api_calculate_returns_400_when_json_is_malformed():
     assert data["success"] is False
     assert data["error"]["code"] == "MALFORMED_JSON"
     assert data["error"]["message"] == "JSON malformado"
+
+
+def test_api_optimize_returns_ranked_designs():
+    client = _client()
+
+    response = client.post(
+        "/api/optimize",
+        json={"bounds": {"R1": [0.1, 5.0], "R2": [0.1, 5.0]}, "objective": "corriente_pico", "max_current": 500},
+    )
+    data = response.get_json()
+
+    assert response.status_code == 200
+    assert data["success"] is True
+    assert data["designs"]
+    assert set(data["designs"][0]["currents"].keys()) == {"I1", "I2", "I3"}
+
+
+def test_api_optimize_returns_400_for_invalid_bounds():
+    client = _client()
+
+    response = client.post("/api/optimize", json={"bounds": {"R1": [0.0, 5000.0]}})
+    data = response.get_json()
+
+    assert response.status_code == 400
+    assert data["error"]["code"] == "OPTIMIZATION_ERROR"
+
+
+def test_api_metrics_reports_single_flight_counters():
+    client = _client()
+
+    client.post("/api/calculate", json=DEFAULT_VALUES)
+    client.get("/circuito.png")
+    response = client.get("/api/metrics")
+    data = response.get_json()
+
+    assert response.status_code == 200
+    assert data["single_flight"]["calculate"]["executed"] == 1
+    assert data["single_flight"]["circuito"]["executed"] == 1
+    assert data["single_flight"]["calculate"]["in_flight"] == 0
+
+
+def test_api_stream_pushes_results_for_updates():
+    client = _client()
+
+    response = client.get("/api/stream?diagram=1", buffered=False)
+    chunks = response.iter_encoded()
+
+    assert response.status_code == 200
+    assert response.mimetype == "text/event-stream"
+    ready = next(chunks).decode("utf-8")
+    stream_id = json.loads(ready.split("data: ", 1)[1])["stream_id"]
+    next(chunks)
+
+    update = client.post(f"/api/stream/{stream_id}", json={"R1": 2.5})
+    result = json.loads(next(chunks).decode("utf-8").split("data: ", 1)[1])
+    response.close()
+
+    assert update.status_code == 202
+    assert set(result["currents"].keys()) == {"I1", "I2", "I3"}
+    assert "R1=2.5" in result["diagram_url"]
+
+
+def test_api_stream_update_rejects_unknown_stream_and_invalid_values():
+    client = _client()
+
+    assert client.post("/api/stream/missing", json={"R1": 1.0}).status_code == 404
+
+    response = client.get("/api/stream", buffered=False)
+    ready = next(response.iter_encoded()).decode("utf-8")
+    stream_id = json.loads(ready.split("data: ", 1)[1])["stream_id"]
+    invalid = client.post(f"/api/stream/{stream_id}", json={"R1": 0})
+    response.close()
+
+    assert invalid.status_code == 400
+    assert invalid.get_json()["error"]["code"] == "INVALID_PAYLOAD"
+
+
+def test_api_contingency_returns_worst_case_per_mesh():
+    client = _client()
+
+    response = client.post("/api/contingency", json={**DEFAULT_VALUES, "double": True})
+    data = response.get_json()
+
+    assert response.status_code == 200
+    assert data["success"] is True
+    assert len(data["cases"]) == 45
+    assert set(data["worst_case"].keys()) == {"I1", "I2", "I3"}
+
+
+def test_api_contingency_returns_400_for_out_of_range_values():
+    client = _client()
+
+    response = client.post("/api/contingency", json={**DEFAULT_VALUES, "R1": 5000})
+
+    assert response.status_code == 400
+    assert response.get_json()["error"]["code"] == "CALCULATION_ERROR"
+
+
+def test_api_stream_head_request_releases_stream_slot():
+    app = create_app()
+    client = app.test_client()
+
+    response = client.head("/api/stream")
+    response.close()
+
+    assert response.status_code == 200
+    assert app.extensions["live_stream"].active() == 0
+
+
+def test_api_contingency_rejects_non_boolean_double():
+    client = _client()
+
+    response = client.post("/api/contingency", json={**DEFAULT_VALUES, "double": "false"})
+
+    assert response.status_code == 400
+    assert response.get_json()["error"]["code"] == "INVALID_PAYLOAD"
+
+
+def test_api_contingency_returns_json_500_on_unexpected_error(monkeypatch):
+    def boom(*args, **kwargs):
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr("src.routes.api.MeshAnalyzer.analizar_contingencias", boom)
+    client = _client()
+
+    response = client.post("/api/contingency", json=DEFAULT_VALUES)
+
+    assert response.status_code == 500
+    assert response.get_json()["error"]["code"] == "INTERNAL_ERROR"
+
+
+def test_api_optimize_rejects_non_finite_time_budget_and_boolean_current():
+    client = _client()
+    bounds = {"R1": [0.1, 5.0]}
+
+    for extra in ({"time_budget": "nan"}, {"time_budget": "inf"}, {"max_current": True}):
+        response = client.post("/api/optimize", json={"bounds": bounds, **extra})
+
+        assert response.status_code == 400
+        assert response.get_json()["error"]["code"] == "OPTIMIZATION_ERROR"
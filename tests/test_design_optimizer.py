@@ -0,0 +1,73 @@
+import numpy as np
+import pytest
+
+from src.config import DEFAULT_VALUES, REQUIRED_PARAMS
+from src.services.design_optimizer import optimizar_diseno
+from src.services.mesh_analyzer import MeshAnalyzer
+
+
+def test_calcular_corrientes_lote_matches_scalar_solver():
+    R = np.array([[DEFAULT_VALUES[key] for key in REQUIRED_PARAMS[:6]], [2.0, 4.0, 3.0, 6.0, 5.0, 2.0]])
+    V = np.array([[DEFAULT_VALUES[key] for key in REQUIRED_PARAMS[6:]], [12.0, 0.0, 0.0]])
+
+    lote = MeshAnalyzer.calcular_corrientes_lote(R, V)
+
+    for fila in range(2):
+        esperado = MeshAnalyzer.calcular_corrientes(*R[fila], *V[fila])[:3]
+        assert np.allclose(lote[fila], esperado)
+
+
+def test_optimizar_diseno_respects_bounds_and_current_limit():
+    result = optimizar_diseno(
+        {"R1": (0.1, 5.0), "R2": (0.1, 5.0), "R3": (0.1, 5.0)},
+        objetivo="perdidas",
+        corriente_maxima=100.0,
+    )
+
+    assert result["grid_complete"] is True
+    assert result["designs"]
+    objetivos = [d["objective"] for d in result["designs"]]
+    assert objetivos == sorted(objetivos)
+    for diseno in result["designs"]:
+        assert all(0.1 <= diseno["params"][key] <= 5.0 for key in ("R1", "R2", "R3"))
+        assert diseno["params"]["R4"] == DEFAULT_VALUES["R4"]
+        assert max(abs(i) for i in diseno["currents"].values()) <= 100.0
+
+
+def test_optimizar_diseno_refines_beyond_grid_for_peak_current():
+    limites = {"R1": (0.5, 2.0), "R2": (0.5, 2.0)}
+    grid_only = optimizar_diseno(limites, objetivo="corriente_pico", puntos_por_eje=3, iteraciones_refinamiento=0)
+    refined = optimizar_diseno(limites, objetivo="corriente_pico", puntos_por_eje=3)
+
+    assert refined["designs"][0]["objective"] <= grid_only["designs"][0]["objective"]
+    best = refined["designs"][0]["params"]
+    I1, I2, I3, _, _ = MeshAnalyzer.calcular_corrientes(*(best[key] for key in REQUIRED_PARAMS))
+    assert refined["designs"][0]["peak_current"] == pytest.approx(max(abs(I1), abs(I2), abs(I3)))
+
+
+def test_optimizar_diseno_returns_no_designs_when_infeasible():
+    result = optimizar_diseno({"R1": (0.1, 1.0)}, corriente_maxima=0.001)
+
+    assert result["designs"] == []
+    assert result["evaluated"] > 0
+
+
+def test_optimizar_diseno_rejects_bounds_outside_resistance_range():
+    with pytest.raises(ValueError):
+        optimizar_diseno({"R1": (0.001, 10.0)})
+
+    with pytest.raises(ValueError):
+        optimizar_diseno({"V1": (1.0, 10.0)})
+
+
+@pytest.mark.parametrize("objetivo", ["perdidas", "corriente_pico"])
+def test_optimizar_diseno_returns_distinct_designs(objetivo):
+    result = optimizar_diseno({"R1": (0.1, 5.0), "R2": (0.1, 5.0), "R3": (0.1, 5.0)}, objetivo=objetivo)
+
+    filas = [[d["params"][key] for key in REQUIRED_PARAMS[:6]] for d in result["designs"]]
+    assert len(filas) == 5
+    for i in range(len(filas)):
+        for j in range(i + 1, len(filas)):
+            assert not np.allclose(filas[i], filas[j], rtol=1e-3, atol=0)
+    objetivos = [d["objective"] for d in result["designs"]]
+    assert objetivos == sorted(objetivos)
@@ -0,0 +1,79 @@
+import json
+import threading
+
+from src.config import DEFAULT_VALUES
+from src.services.live_stream import LiveStreamHub
+
+
+def _hub(**overrides):
+    options = {"debounce": 0.01, "heartbeat": 0.05, "idle_timeout": 5.0}
+    options.update(overrides)
+    return LiveStreamHub(**options)
+
+
+def _parse(chunk):
+    lines = dict(line.split(": ", 1) for line in chunk.strip().splitlines())
+    return lines["event"], json.loads(lines["data"])
+
+
+def test_live_stream_computes_initial_state_and_only_latest_update():
+    hub = _hub()
+    stream_id = hub.open(DEFAULT_VALUES)
+    computed = []
+    events = hub.events(stream_id, lambda params: computed.append(params["R1"]) or {"R1": params["R1"]})
+
+    assert _parse(next(events)) == ("ready", {"stream_id": stream_id})
+    assert _parse(next(events)) == ("result", {"R1": DEFAULT_VALUES["R1"]})
+
+    for value in (1.0, 2.0, 3.0):
+        hub.update(stream_id, {**DEFAULT_VALUES, "R1": value})
+
+    assert _parse(next(events)) == ("result", {"R1": 3.0})
+    assert computed == [DEFAULT_VALUES["R1"], 3.0]
+    events.close()
+    assert hub.active() == 0
+
+
+def test_live_stream_reports_errors_and_sends_heartbeats():
+    hub = _hub()
+    stream_id = hub.open(DEFAULT_VALUES)
+
+    def compute(params):
+        raise ValueError("Sistema singular")
+
+    events = hub.events(stream_id, compute)
+    next(events)
+
+    assert _parse(next(events)) == ("calculation_error", {"message": "Sistema singular"})
+    assert next(events) == ": ping\n\n"
+
+
+def test_live_stream_closes_idle_streams():
+    hub = _hub(idle_timeout=0.05)
+    stream_id = hub.open(DEFAULT_VALUES)
+
+    list(hub.events(stream_id, lambda params: {}))
+    assert hub.active() == 0
+    assert hub.update(stream_id, DEFAULT_VALUES) is False
+
+
+def test_live_stream_close_wakes_waiting_generator():
+    hub = _hub(heartbeat=5.0)
+    stream_id = hub.open(DEFAULT_VALUES)
+    events = hub.events(stream_id, lambda params: {})
+    next(events)
+    next(events)
+
+    threading.Timer(0.05, hub.close, args=(stream_id,)).start()
+    assert list(events) == []
+
+
+def test_live_stream_expires_streams_whose_generator_never_started():
+    hub = _hub(idle_timeout=0.05)
+    stream_id = hub.open(DEFAULT_VALUES)
+
+    threading.Event().wait(0.06)
+
+    hub.open(DEFAULT_VALUES)
+    assert hub.active() == 1
+    assert hub.update(stream_id, DEFAULT_VALUES) is False
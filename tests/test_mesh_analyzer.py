@@ -1,5 +1,7 @@
+import numpy as np
 import pytest
 
+from src.config import DEFAULT_VALUES, EXAMPLE_VALUES, RESISTANCE_RANGE, VOLTAGE_RANGE
 from src.services.mesh_analyzer import MeshAnalyzer
 
 
@@ -43,3 +45,90 @@ def test_interpretar_corrientes_returns_all_meshes():
 
     assert set(result.keys()) == {"I1", "I2", "I3"}
     assert "Sala/Comedor" in result["I1"]
+
+
+def test_resolver_lote_mixed_precision_matches_float64():
+    rng = np.random.default_rng(0)
+    R = np.exp(rng.uniform(*np.log(RESISTANCE_RANGE), (5000, 6)))
+    V = rng.uniform(*VOLTAGE_RANGE, (5000, 3))
+
+    referencia, _ = MeshAnalyzer.resolver_lote(R, V, "float64")
+    corrientes, mal_condicionadas = MeshAnalyzer.resolver_lote(R, V, "mixta")
+
+    assert corrientes.dtype == np.float64
+    escala = np.max(np.abs(referencia), axis=1, keepdims=True)
+    assert np.all(np.abs(corrientes - referencia) <= 1e-9 * escala)
+    assert not mal_condicionadas.any()
+
+
+def test_resolver_lote_condition_flag_is_scale_invariant():
+    R = np.array([[1.0, 1.0, 1.0, 1e12, 1.0, 1.0], [1.0, 2.0, 3.0, 4.0, 5.0, 6.0]])
+    V = np.array([[1.0, 1.0, 1.0], [1.0, 1.0, 1.0]])
+
+    _, mal_condicionadas = MeshAnalyzer.resolver_lote(R, V, "mixta")
+    _, escaladas = MeshAnalyzer.resolver_lote(R * 1e-6, V, "mixta")
+
+    assert mal_condicionadas.tolist() == [True, False]
+    assert escaladas.tolist() == [True, False]
+
+
+def test_resolver_lote_rejects_unknown_precision():
+    with pytest.raises(ValueError):
+        MeshAnalyzer.resolver_lote(np.ones((1, 6)), np.ones((1, 3)), "float16")
+
+
+def _solve_with_outage(params, outage):
+    values = dict(params)
+    for element in outage:
+        values[element] = 0.0 if element.startswith("V") else 1e9
+    A = np.array(
+        [
+            [values["R1"] + values["R4"] + values["R6"], -values["R4"], -values["R6"]],
+            [-values["R4"], values["R2"] + values["R4"] + values["R5"], -values["R5"]],
+            [-values["R6"], -values["R5"], values["R3"] + values["R5"] + values["R6"]],
+        ]
+    )
+    return np.linalg.solve(A, [values["V1"], values["V2"], values["V3"]])
+
+
+def test_analizar_contingencias_matches_direct_solves():
+    result = MeshAnalyzer.analizar_contingencias(DEFAULT_VALUES, dobles=True)
+
+    assert len(result["cases"]) == 9 + 36
+    for case in result["cases"]:
+        expected = _solve_with_outage(DEFAULT_VALUES, case["outage"])
+        assert np.allclose(list(case["currents"].values()), expected, atol=1e-5)
+
+
+def test_analizar_contingencias_reports_worst_case_per_mesh():
+    result = MeshAnalyzer.analizar_contingencias(EXAMPLE_VALUES)
+
+    assert len(result["cases"]) == 9
+    open_r1 = next(case for case in result["cases"] if case["outage"] == ["R1"])
+    assert open_r1["currents"]["I1"] == pytest.approx(0.0, abs=1e-12)
+    for mesh, worst in result["worst_case"].items():
+        assert abs(worst["current"]) == max(abs(case["currents"][mesh]) for case in result["cases"])
+        assert worst["outage"]
+
+
+def test_resolver_lote_flags_match_between_precision_policies():
+    rng = np.random.default_rng(1)
+    R = np.exp(rng.uniform(*np.log(RESISTANCE_RANGE), (2000, 6)))
+    R[:, 3] = np.exp(rng.uniform(np.log(1e8), np.log(1e12), 2000))
+    V = rng.uniform(*VOLTAGE_RANGE, (2000, 3))
+
+    _, flags_float64 = MeshAnalyzer.resolver_lote(R, V, "float64")
+    _, flags_mixta = MeshAnalyzer.resolver_lote(R, V, "mixta")
+
+    assert flags_float64.any() and not flags_float64.all()
+    assert np.array_equal(flags_mixta, flags_float64)
+
+
+def test_calcular_corrientes_lote_shares_the_float64_path_of_resolver_lote():
+    R = np.array([[2.0, 4.0, 3.0, 6.0, 5.0, 2.0], [1.0, 1.0, 1.0, 1e12, 1.0, 1.0]])
+    V = np.array([[12.0, 0.0, 0.0], [1.0, 1.0, 1.0]])
+
+    corrientes, mal_condicionadas = MeshAnalyzer.resolver_lote(R, V, "float64")
+
+    assert mal_condicionadas.tolist() == [False, True]
+    assert np.array_equal(MeshAnalyzer.calcular_corrientes_lote(R, V), corrientes)
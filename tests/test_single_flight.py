@@ -0,0 +1,100 @@
+import threading
+
+import pytest
+
+from src.services.single_flight import SingleFlight
+
+
+def _start_leader(flight, key, release, result="ok"):
+    started = threading.Event()
+
+    def fn():
+        started.set()
+        release.wait(5)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    outcome = {}
+
+    def run():
+        try:
+            outcome["value"] = flight.do(key, fn)
+        except Exception as exc:
+            outcome["error"] = exc
+
+    thread = threading.Thread(target=run)
+    thread.start()
+    assert started.wait(5)
+    return thread, outcome
+
+
+def _start_followers(flight, key, count, timeout=5):
+    outcomes = [{} for _ in range(count)]
+
+    def run(outcome):
+        try:
+            outcome["value"] = flight.do(key, lambda: "not executed", timeout=timeout)
+        except Exception as exc:
+            outcome["error"] = exc
+
+    threads = [threading.Thread(target=run, args=(outcome,)) for outcome in outcomes]
+    for thread in threads:
+        thread.start()
+    return threads, outcomes
+
+
+def _wait_for_coalesced(flight, count):
+    for _ in range(500):
+        if flight.stats()["coalesced"] >= count:
+            return
+        threading.Event().wait(0.01)
+    raise AssertionError("followers did not join the in-flight call")
+
+
+def test_single_flight_shares_result_between_concurrent_callers():
+    flight = SingleFlight()
+    release = threading.Event()
+    leader, leader_outcome = _start_leader(flight, ("a",), release)
+    followers, outcomes = _start_followers(flight, ("a",), 4)
+    _wait_for_coalesced(flight, 4)
+
+    release.set()
+    for thread in [leader, *followers]:
+        thread.join(5)
+
+    assert leader_outcome == {"value": "ok"}
+    assert all(outcome == {"value": "ok"} for outcome in outcomes)
+    assert flight.stats() == {"executed": 1, "coalesced": 4, "errors": 0, "timeouts": 0, "in_flight": 0}
+
+
+def test_single_flight_propagates_errors_and_does_not_cache_them():
+    flight = SingleFlight()
+    release = threading.Event()
+    leader, leader_outcome = _start_leader(flight, "k", release, result=ValueError("boom"))
+    followers, outcomes = _start_followers(flight, "k", 2)
+    _wait_for_coalesced(flight, 2)
+
+    release.set()
+    for thread in [leader, *followers]:
+        thread.join(5)
+
+    assert isinstance(leader_outcome["error"], ValueError)
+    assert all(isinstance(outcome["error"], ValueError) for outcome in outcomes)
+    assert flight.do("k", lambda: "retry") == "retry"
+    assert flight.stats()["errors"] == 1
+    assert flight.stats()["executed"] == 2
+
+
+def test_single_flight_follower_timeout_does_not_cancel_leader():
+    flight = SingleFlight()
+    release = threading.Event()
+    leader, leader_outcome = _start_leader(flight, "k", release)
+
+    with pytest.raises(TimeoutError):
+        flight.do("k", lambda: "not executed", timeout=0.01)
+
+    release.set()
+    leader.join(5)
+    assert leader_outcome == {"value": "ok"}
+    assert flight.stats()["timeouts"] == 1